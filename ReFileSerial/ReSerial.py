@@ -1,5 +1,7 @@
 import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # ===================== 可配置常量（根据需求修改） =====================
 TARGET_FOLDER = r"H:\Tes"  # Windows文件夹路径
@@ -8,10 +10,69 @@ CONNECTOR = ". "  # 序号与原内容的连接符
 PREFIX_CHAR = "No."  # 最终文件名的前缀字符
 BASE_SERIAL = 0  # 基准常量（默认10，新序号在此基础上累加计算）
 SEPARATORS = ['.', '、', ' ']  # 抽离的分隔符常量，支持灵活添加新分隔符
+RENAME_WORKERS = 8  # 并行执行重命名的线程数（1=逐个顺序执行）
 
 
 # ====================================================================
 
+# 将分隔符列表转为正则兼容的字符集（自动转义特殊字符，避免.等特殊正则字符失效）
+_SEP_PATTERN = ''.join(re.escape(sep) for sep in SEPARATORS)
+# 预编译序号文件名正则（模块加载时编译一次，扫描时直接复用）
+# ^(\d+)：以数字开头并捕获序号
+# [{_SEP_PATTERN}]+：匹配1个及以上配置的分隔符
+# (.*)：捕获分隔符后的文件原内容
+_SEQ_RE = re.compile(rf"^(\d+)[{_SEP_PATTERN}]+(.*)$")
+
+# 新文件名模板（前缀、补位位数、连接符在加载时固定，循环中只需填入序号、内容、扩展名）
+# 前缀与连接符中的花括号需转义，避免被 str.format 当作占位符
+_PREFIX_LIT = PREFIX_CHAR.replace("{", "{{").replace("}", "}}")
+_CONNECTOR_LIT = CONNECTOR.replace("{", "{{").replace("}", "}}")
+_NAME_TMPL = _PREFIX_LIT + "{0:0" + str(SERIAL_PAD) + "d}" + _CONNECTOR_LIT + "{1}{2}"
+# 重名时使用的模板：在原内容后追加 (1)、(2)... 后缀
+_NAME_TMPL_DUP = _PREFIX_LIT + "{0:0" + str(SERIAL_PAD) + "d}" + _CONNECTOR_LIT + "{1}({2}){3}"
+
+_LOG_BATCH = 500  # 重命名结果日志每累积多少行写出一次
+
+if os.name == "nt":
+    import ctypes
+    from ctypes import wintypes
+
+    # Windows：直接调用 MoveFileExW，省去 os.rename 每次调用的封装开销
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _MoveFileExW = _kernel32.MoveFileExW
+    _MoveFileExW.argtypes = (wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD)
+    _MoveFileExW.restype = wintypes.BOOL
+
+    def _rename(old_path, new_path):
+        """重命名文件（目标已存在时失败，不会覆盖）"""
+        if not _MoveFileExW(old_path, new_path, 0):
+            raise ctypes.WinError(ctypes.get_last_error())
+else:
+    _rename = os.rename
+
+
+def _rename_task(pair):
+    """执行单个重命名任务，返回捕获的异常（成功时为None），便于主线程按顺序输出结果"""
+    try:
+        _rename(*pair)
+    except Exception as e:
+        return e
+    return None
+
+
+class SeqFile:
+    """序号格式文件的记录（使用 __slots__，比字典更省内存、属性访问更快）"""
+    __slots__ = ("old_path", "name", "serial_num", "content", "ext", "final_serial")
+
+    def __init__(self, old_path, name, serial_num, content, ext, final_serial=0):
+        self.old_path = old_path  # 原文件完整路径
+        self.name = name  # 原文件名（取自目录项，无需再从路径中拆分）
+        self.serial_num = serial_num  # 原序号
+        self.content = content  # 序号后的文件内容
+        self.ext = ext  # 文件扩展名
+        self.final_serial = final_serial  # 反转+基准累加后的最终序号
+
+
 def is_sequence_file(filename):
     """
     判断文件名是否符合序号格式（无前缀，匹配数字+配置分隔符格式）
@@ -20,36 +81,56 @@ def is_sequence_file(filename):
     # 分离文件名和扩展名
     name_without_ext, ext = os.path.splitext(filename)
 
-    try:
-        # 步骤1：将分隔符列表转为正则兼容的字符集（自动转义特殊字符）
-        # 对每个分隔符进行转义，避免.等特殊正则字符失效
-        escaped_separators = [re.escape(sep) for sep in SEPARATORS]
-        # 拼接为正则字符集：如 [\.、\s]（注：空格转义后仍为空格，不影响匹配）
-        separator_pattern = ''.join(escaped_separators)
-
-        # 步骤2：构建正则表达式，使用配置的分隔符
-        # ^(\d+)：以数字开头并捕获序号
-        # [{separator_pattern}]+：匹配1个及以上配置的分隔符
-        # (.*)：捕获分隔符后的文件原内容
-        pattern = rf"^(\d+)[{separator_pattern}]+(.*)$"
-        match = re.match(pattern, name_without_ext, re.IGNORECASE)
-
-        if match:
-            # 提取并验证序号有效性
-            serial_str = match.group(1)
-            if not serial_str.isdigit():
-                return False, None, None, ext
-            serial_num = int(serial_str)
-            # 提取并清理原内容（去除首尾空白）
-            content = match.group(2).strip()
-            return True, serial_num, content, ext
-    except Exception as e:
-        # 捕获正则匹配异常，输出调试信息
-        print(f"调试：文件名 {filename} 匹配正则时出错 - {str(e)}")
+    # 快速预判：不以数字开头的文件名必然不匹配，直接跳过正则匹配
+    if not name_without_ext or not name_without_ext[0].isdigit():
+        return False, None, None, ext
+
+    # 正则已在模块加载时预编译，匹配本身不会抛出异常
+    match = _SEQ_RE.match(name_without_ext)
+    if match:
+        # 提取序号（\d+ 已保证全部为数字，可直接转换）
+        serial_num = int(match.group(1))
+        # 提取并清理原内容（去除首尾空白）
+        content = match.group(2).strip()
+        return True, serial_num, content, ext
 
     return False, None, None, ext
 
 
+def plan_renames(sequence_files, existing_names):
+    """
+    生成重命名计划（第一阶段，只在内存中计算，不触碰文件系统）
+    existing_names：文件夹内已有名称的集合（normcase 后），会随计划占用的新名称同步更新
+    返回：(重命名计划 [(原路径, 新路径)], 对应的 [(原文件名, 新文件名)], 无需修改的文件数)
+    """
+    rename_plan = []
+    rename_names = []  # 与 rename_plan 一一对应的 (原文件名, 新文件名)，用于输出结果
+    skipped_count = 0
+    for file_info in sequence_files:
+        # 按预生成的模板拼接新文件名：前缀 + 补位序号 + 连接符 + 原内容 + 扩展名
+        final_serial = file_info.final_serial
+        content = file_info.content
+        ext = file_info.ext
+        temp_new_name = _NAME_TMPL.format(final_serial, content, ext)
+
+        # 文件名已是目标名称（如序号反转后不变），无需重命名
+        if temp_new_name == file_info.name:
+            skipped_count += 1
+            continue
+
+        # 安全防护：避免新文件名重复，自动添加(1)、(2)...后缀（在内存名称集合中检查，不再逐次查询磁盘）
+        # 原文件名在计划阶段不释放，保证任一重命名失败时也不会覆盖尚未处理的文件
+        counter = 1
+        while os.path.normcase(temp_new_name) in existing_names:
+            temp_new_name = _NAME_TMPL_DUP.format(final_serial, content, counter, ext)
+            counter += 1
+        existing_names.add(os.path.normcase(temp_new_name))
+        rename_plan.append((file_info.old_path, os.path.join(TARGET_FOLDER, temp_new_name)))
+        rename_names.append((file_info.name, temp_new_name))
+
+    return rename_plan, rename_names, skipped_count
+
+
 def main():
     # 1. 验证目标文件夹是否存在
     if not os.path.exists(TARGET_FOLDER):
@@ -57,21 +138,17 @@ def main():
         return
 
     # 2. 遍历文件夹，筛选符合序号格式的文件（包含重复序号）
-    sequence_files = []
-    for filename in os.listdir(TARGET_FOLDER):
-        file_path = os.path.join(TARGET_FOLDER, filename)
-        if os.path.isdir(file_path):  # 跳过文件夹，只处理文件
-            continue
-
-        # 判断是否为序号格式文件
-        is_seq, serial_num, content, ext = is_sequence_file(filename)
-        if is_seq:
-            sequence_files.append({
-                "old_path": file_path,
-                "serial_num": serial_num,
-                "content": content,
-                "ext": ext
-            })
+    # 使用 os.scandir 一次遍历，直接复用目录项自带的类型信息，避免逐个文件再查询属性
+    with os.scandir(TARGET_FOLDER) as it:
+        entries = list(it)
+    # 文件夹内已有的全部名称（按系统规则统一大小写），用于在内存中检查重名
+    existing_names = {os.path.normcase(entry.name) for entry in entries}
+    # 只处理文件（跳过文件夹），筛选与记录合并为一个列表推导式
+    sequence_files = [
+        SeqFile(entry.path, entry.name, serial_num, content, ext)
+        for entry in entries if entry.is_file()
+        for is_seq, serial_num, content, ext in (is_sequence_file(entry.name),) if is_seq
+    ]
 
     # 3. 若没有符合条件的文件，直接退出
     if not sequence_files:
@@ -80,57 +157,48 @@ def main():
 
     # 4. 基于基准常量实现序号反转+累加（核心功能）
     # 步骤1：提取所有不重复的原序号，按升序排序
-    unique_serials = sorted(list(set([f["serial_num"] for f in sequence_files])))
+    unique_serials = sorted({f.serial_num for f in sequence_files})
     # 步骤2：先对真实序号进行精准反转（保留原数值倒序）
     reversed_unique_serials = unique_serials[::-1]
-    # 步骤3：建立 原序号 -> 基准累加后新序号 的映射（核心逻辑）
-    serial_reverse_map = {}
-    for original, reversed_serial in zip(unique_serials, reversed_unique_serials):
-        new_serial = BASE_SERIAL + reversed_serial  # 基准值累加反转序号
-        serial_reverse_map[original] = new_serial
+    # 步骤3：建立 原序号 -> 基准累加后新序号 的映射（基准值累加反转序号）
+    serial_reverse_map = dict(zip(unique_serials, (BASE_SERIAL + s for s in reversed_unique_serials)))
 
     # 步骤4：为每个文件分配最终新序号（重复原序号对应相同新序号）
     for file_info in sequence_files:
-        original_serial = file_info["serial_num"]
-        file_info["final_serial"] = serial_reverse_map[original_serial]
+        file_info.final_serial = serial_reverse_map[file_info.serial_num]
+
+    # 5. 生成重命名计划：先确定并校验全部文件的新路径，再集中执行重命名
+    rename_plan, rename_names, skipped_count = plan_renames(sequence_files, existing_names)
+
+    # 6. 执行重命名操作（全部文件均已是目标名称时直接结束）
+    if not rename_plan:
+        print(f"所有文件均已是目标名称，无需重命名（共 {skipped_count} 个）")
+        return
+
+    # 计划阶段已保证所有目标名称互不相同且不与现有文件重名，可安全地多线程并行执行
+    with ThreadPoolExecutor(max_workers=RENAME_WORKERS) as executor:
+        results = list(executor.map(_rename_task, rename_plan))
 
-    # 5. 执行重命名操作
+    # 按计划顺序输出结果（日志先缓存，分批写出，避免逐行 print 的控制台开销）
     success_count = 0
-    for file_info in sequence_files:
-        try:
-            # 格式化最终序号（按配置补位）
-            formatted_serial = f"{file_info['final_serial']:0{SERIAL_PAD}d}"
-
-            # 拼接新文件名：前缀 + 补位序号 + 连接符 + 原内容 + 扩展名
-            new_name = (
-                f"{PREFIX_CHAR}{formatted_serial}{CONNECTOR}"
-                f"{file_info['content']}{file_info['ext']}"
-            )
-            new_path = os.path.join(TARGET_FOLDER, new_name)
-
-            # 安全防护：避免新文件名重复，自动添加(1)、(2)...后缀
-            counter = 1
-            temp_new_path = new_path
-            while os.path.exists(temp_new_path):
-                temp_new_name = (
-                    f"{PREFIX_CHAR}{formatted_serial}{CONNECTOR}"
-                    f"{file_info['content']}({counter}){file_info['ext']}"
-                )
-                temp_new_path = os.path.join(TARGET_FOLDER, temp_new_name)
-                counter += 1
-
-            # 执行重命名
-            os.rename(file_info["old_path"], temp_new_path)
+    log_lines = []
+    for (old_filename, new_filename), error in zip(rename_names, results):
+        if error is None:
             success_count += 1
-            old_filename = os.path.basename(file_info["old_path"])
-            new_filename = os.path.basename(temp_new_path)
-            print(f"成功：{old_filename[:8]} -----> {new_filename}")
-        except Exception as e:
-            old_filename = os.path.basename(file_info["old_path"])
-            print(f"失败：处理 {old_filename} 时出错 - {str(e)}")
-
-    # 6. 输出最终统计信息
-    print(f"\n重命名完成！成功：{success_count} 个，失败：{len(sequence_files) - success_count} 个")
+            log_lines.append(f"成功：{old_filename[:8]} -----> {new_filename}\n")
+        else:
+            log_lines.append(f"失败：处理 {old_filename} 时出错 - {str(error)}\n")
+        if len(log_lines) >= _LOG_BATCH:
+            sys.stdout.write("".join(log_lines))
+            log_lines.clear()
+    sys.stdout.write("".join(log_lines))
+    sys.stdout.flush()
+
+    # 7. 输出最终统计信息
+    print(
+        f"\n重命名完成！成功：{success_count} 个，失败：{len(rename_plan) - success_count} 个，"
+        f"无需修改：{skipped_count} 个"
+    )
     print(f"基准常量：{BASE_SERIAL}")
     print(f"配置分隔符：{SEPARATORS}")
     print(f"原唯一序号：{unique_serials}")
@@ -146,5 +214,6 @@ if __name__ == "__main__":
     print(f"文件名前缀：{PREFIX_CHAR}")
     print(f"基准常量（新序号累加基础）：{BASE_SERIAL}")
     print(f"配置的匹配分隔符：{SEPARATORS}")
+    print(f"重命名线程数：{RENAME_WORKERS}")
     print("==================================================================")
     main()
\ No newline at end of file
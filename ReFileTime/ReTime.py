@@ -8,15 +8,24 @@ import win32file
 import win32con
 
 
-def convert_to_timestamp(time_str: str, format_str: str = "%Y-%m-%d %H:%M:%S") -> float:
-    """将时间字符串转换为时间戳（秒级）"""
+def convert_to_datetime(time_str: str, format_str: str = "%Y-%m-%d %H:%M:%S") -> datetime:
+    """将时间字符串转换为本地时间的datetime对象"""
     try:
-        dt = datetime.strptime(time_str, format_str)
-        return time.mktime(dt.timetuple())
+        return datetime.strptime(time_str, format_str)
     except ValueError as e:
         raise ValueError(f"时间格式错误！请按照 {format_str} 格式输入，错误信息：{e}")
 
 
+def convert_to_timestamp(time_str: str, format_str: str = "%Y-%m-%d %H:%M:%S") -> float:
+    """将时间字符串转换为时间戳（秒级）"""
+    return convert_to_datetime(time_str, format_str).timestamp()
+
+
+def datetime_to_ns(dt: datetime) -> int:
+    """将本地时间的datetime对象转换为纳秒级时间戳（整数运算，不经浮点损失精度）"""
+    return int(dt.replace(microsecond=0).timestamp()) * 1_000_000_000 + dt.microsecond * 1_000
+
+
 def modify_file_times(
         file_path: str,
         create_time: str = None,
@@ -38,52 +47,54 @@ def modify_file_times(
     if not os.path.isfile(file_path):
         raise IsADirectoryError(f"目标路径不是文件：{file_path}")
 
-    # 转换时间为时间戳（空则保留None）
-    new_create_ts = convert_to_timestamp(create_time, time_format) if create_time else None
-    new_modify_ts = convert_to_timestamp(modify_time, time_format) if modify_time else None
-    new_access_ts = convert_to_timestamp(access_time, time_format) if access_time else None
+    # 转换时间为datetime对象（空则保留None）
+    new_create_dt = convert_to_datetime(create_time, time_format) if create_time else None
+    new_modify_dt = convert_to_datetime(modify_time, time_format) if modify_time else None
+    new_access_dt = convert_to_datetime(access_time, time_format) if access_time else None
 
     system = platform.system()
     try:
         if system == "Windows":
             # Windows：支持修改创建/修改/访问时间
-            def ts_to_pywintime(ts):
-                """时间戳转pywintypes.Time对象（避免整数溢出）"""
-                local_dt = datetime.fromtimestamp(ts)
-                return pywintypes.Time(local_dt)
-
-            # 打开文件句柄
-            handle = win32file.CreateFile(
-                file_path,
-                win32con.GENERIC_WRITE,
-                win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
-                None,
-                win32con.OPEN_EXISTING,
-                win32con.FILE_ATTRIBUTE_NORMAL | win32con.FILE_FLAG_BACKUP_SEMANTICS,
-                None
-            )
-
-            # 获取原时间（pywintypes.Time类型）
-            original_create, original_access, original_modify = win32file.GetFileTime(handle)
-
-            # 替换需修改的时间（空则保留原始值）
-            final_create = ts_to_pywintime(new_create_ts) if new_create_ts else original_create
-            final_access = ts_to_pywintime(new_access_ts) if new_access_ts else original_access
-            final_modify = ts_to_pywintime(new_modify_ts) if new_modify_ts else original_modify
-
-            # 设置新时间
-            win32file.SetFileTime(handle, final_create, final_access, final_modify)
-            handle.close()
+            # 三个时间均未指定时无需改动，直接跳过打开/读取/写入文件时间
+            if any(dt is not None for dt in (new_create_dt, new_access_dt, new_modify_dt)):
+                # 打开文件句柄（仅申请读写属性的最小权限，GetFileTime/SetFileTime 已足够）
+                handle = win32file.CreateFile(
+                    file_path,
+                    win32con.FILE_READ_ATTRIBUTES | win32con.FILE_WRITE_ATTRIBUTES,
+                    win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
+                    None,
+                    win32con.OPEN_EXISTING,
+                    win32con.FILE_ATTRIBUTE_NORMAL | win32con.FILE_FLAG_BACKUP_SEMANTICS,
+                    None
+                )
+
+                # 获取原时间（pywintypes.Time类型）
+                original_create, original_access, original_modify = win32file.GetFileTime(handle)
+
+                # 替换需修改的时间（空则保留原始值，datetime直接转pywintypes.Time，避免整数溢出）
+                final_create, final_access, final_modify = (
+                    pywintypes.Time(dt) if dt else orig
+                    for dt, orig in zip(
+                        (new_create_dt, new_access_dt, new_modify_dt),
+                        (original_create, original_access, original_modify)
+                    )
+                )
+
+                # 设置新时间
+                win32file.SetFileTime(handle, final_create, final_access, final_modify)
+                handle.close()
 
         else:
             # Linux/macOS：仅支持修改修改/访问时间（创建时间无法修改）
-            if new_create_ts:
+            if new_create_dt:
                 print("⚠️ 警告：Linux/macOS不支持修改创建时间，该参数已忽略")
 
-            # 构造utime的时间元组（空则用当前时间戳）
-            utime_access = new_access_ts or time.time()
-            utime_modify = new_modify_ts or time.time()
-            os.utime(file_path, (utime_access, utime_modify))
+            # 构造utime的纳秒级时间元组（空则用当前时间戳），直接走 utimensat 的纳秒接口
+            now_ns = int(time.time() * 1_000_000_000)
+            access_ns = datetime_to_ns(new_access_dt) if new_access_dt else now_ns
+            modify_ns = datetime_to_ns(new_modify_dt) if new_modify_dt else now_ns
+            os.utime(file_path, ns=(access_ns, modify_ns))
 
         # 输出结果
         print(f"✅ 文件时间修改成功！")